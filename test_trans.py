@@ -99,6 +99,13 @@ class TestSanitizeFilename:
         assert sanitize_filename("  Hello World  ") == "Hello_World"
         assert sanitize_filename("_Hello_") == "Hello"
 
+    def test_special_chars_removed_not_separated(self):
+        # Punctuation between letters is dropped, not turned into '_'
+        assert sanitize_filename("a.b!c") == "abc"
+
+    def test_mixed_space_underscore_runs_collapse(self):
+        assert sanitize_filename("Hello _ _ World") == "Hello_World"
+
     def test_unicode_preserved(self):
         # Alphanumeric includes unicode letters
         result = sanitize_filename("Café Video")
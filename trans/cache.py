@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import atexit
+import random
 import sqlite3
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from platformdirs import user_cache_dir
 
 
+def _pack(transcript: str) -> bytes:
+    """Compress a transcript for storage (~3-5x smaller for prose)."""
+    return zlib.compress(transcript.encode('utf-8'), 6)
+
+
+def _unpack(value: bytes | str) -> str:
+    """Decode a stored transcript, handling legacy uncompressed rows."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
 def _cache_dir() -> Path:
     return Path(user_cache_dir("trans"))
 
@@ -17,42 +36,175 @@ def _cache_db() -> Path:
     return _cache_dir() / "transcripts.db"
 
 
-def _init_db(db_path: Path) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS transcripts (
-            video_id TEXT PRIMARY KEY,
-            url TEXT,
-            title TEXT,
-            transcript TEXT,
-            format TEXT,
-            model TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-
 class CacheManager:
     def __init__(self, db_path: Path | None = None) -> None:
         self._db = db_path or _cache_db()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writer: ThreadPoolExecutor | None = None
+        atexit.register(self.close)
 
-    def get(self, video_id: str, fmt: str = 'txt', ttl_days: int = 30) -> tuple[str, str] | None:
-        """Return (transcript, title) if cached and within TTL, else None."""
+    def _connect(self) -> sqlite3.Connection:
+        """Return the persistent connection, opening and tuning it on first use.
+
+        Thread-safe: batch download workers and the main thread can race on
+        first access, and the open/PRAGMA/migration sequence must run exactly
+        once (a concurrent second run of the expires_at migration would fail
+        with 'duplicate column name').
+        """
+        if self._conn is not None:
+            return self._conn
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            self._db.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                f'file:{self._db}?mode=rwc',
+                uri=True,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Concurrent invocations (shell-parallel batches) share this DB;
+            # wait out a writer's lock instead of failing immediately.
+            conn.execute('PRAGMA busy_timeout=5000')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-64000')
+            conn.execute('PRAGMA mmap_size=30000000')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT,
+                    url TEXT,
+                    title TEXT,
+                    transcript TEXT,
+                    format TEXT,
+                    model TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at INTEGER,
+                    PRIMARY KEY (video_id, format)
+                )
+            ''')
+            # Migrate pre-expires_at databases: add the column and backfill
+            # it from created_at so old rows keep their remaining TTL.
+            info = list(conn.execute('PRAGMA table_info(transcripts)'))
+            cols = {row[1] for row in info}
+            if 'expires_at' not in cols:
+                conn.execute('ALTER TABLE transcripts ADD COLUMN expires_at INTEGER')
+                conn.execute(
+                    """UPDATE transcripts SET expires_at =
+                       CAST(strftime('%s', created_at) AS INTEGER) + 30 * 86400"""
+                )
+            # Migrate databases keyed on video_id alone: the key is really
+            # (video_id, format) — a single-column PK made caching a second
+            # format silently evict the first, and lookups had to filter on
+            # format after the probe. Rebuilding is the only way to change
+            # a PK in SQLite.
+            pk_cols = [row[1] for row in sorted(
+                (row for row in info if row[5]), key=lambda row: row[5]
+            )]
+            if pk_cols != ['video_id', 'format']:
+                conn.execute('BEGIN')
+                try:
+                    conn.execute('''
+                        CREATE TABLE transcripts_pkfix (
+                            video_id TEXT,
+                            url TEXT,
+                            title TEXT,
+                            transcript TEXT,
+                            format TEXT,
+                            model TEXT,
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            expires_at INTEGER,
+                            PRIMARY KEY (video_id, format)
+                        )
+                    ''')
+                    conn.execute('''
+                        INSERT INTO transcripts_pkfix
+                        SELECT video_id, url, title, transcript, format,
+                               model, created_at, expires_at
+                        FROM transcripts
+                    ''')
+                    conn.execute('DROP TABLE transcripts')
+                    conn.execute('ALTER TABLE transcripts_pkfix RENAME TO transcripts')
+                    conn.execute('COMMIT')
+                except sqlite3.Error:
+                    conn.execute('ROLLBACK')
+                    raise
+            # The composite PK's autoindex answers the point lookup; the
+            # older helper indexes are redundant against it.
+            conn.execute('DROP INDEX IF EXISTS idx_tx_lookup')
+            conn.execute('DROP INDEX IF EXISTS idx_tx_expiry')
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Drain pending background writes, then close the connection.
+
+        The writer must drain first — closing the connection under an
+        in-flight put_async would kill it with 'Cannot operate on a closed
+        database' after the user was already told the result was cached.
+        """
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._conn is not None:
+            try:
+                self._conn.execute('PRAGMA optimize')
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+            self._conn = None
+
+    def prune(self) -> int:
+        """Delete expired rows. Returns number of rows deleted."""
+        if not self._db.exists():
+            return 0
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                'DELETE FROM transcripts WHERE expires_at <= ?',
+                (int(time.time()),),
+            )
+            deleted = cursor.rowcount
+        if deleted:
+            # Deletes only free pages internally; reclaim the file space
+            # once the DB has grown past the threshold.
+            self.maybe_vacuum()
+        return deleted
+
+    def maybe_vacuum(self, size_mb_threshold: float = 100.0) -> bool:
+        """Run VACUUM if the DB file has grown past the threshold."""
+        if not self._db.exists():
+            return False
+        if self._db.stat().st_size / (1024 * 1024) < size_mb_threshold:
+            return False
+        self._connect().execute('VACUUM')
+        return True
+
+    def get(self, video_id: str, fmt: str = 'txt') -> tuple[str, str] | None:
+        """Return (transcript, title) if cached and unexpired, else None.
+
+        Expiry is fixed at write time via expires_at — lowering
+        cache.ttl_days in config affects rows written afterwards, not
+        existing ones (use cache clear to drop those).
+        """
         if not self._db.exists():
             return None
-        conn = sqlite3.connect(self._db)
-        cursor = conn.execute(
+        # Amortized cleanup: prune stale rows on ~1% of lookups
+        if random.random() < 0.01:
+            self.prune()
+        # expires_at is materialized at insert time, so the lookup is a pure
+        # integer compare — no per-query datetime('now', ...) evaluation.
+        cursor = self._connect().execute(
             '''SELECT transcript, title FROM transcripts
-               WHERE video_id = ? AND format = ?
-               AND created_at > datetime('now', ?)''',
-            (video_id, fmt, f'-{ttl_days} days'),
+               WHERE video_id = ? AND format = ? AND expires_at > ?''',
+            (video_id, fmt, int(time.time())),
         )
         row = cursor.fetchone()
-        conn.close()
-        return row if row else None
+        if row is None:
+            return None
+        return _unpack(row[0]), row[1]
 
     def put(
         self,
@@ -62,40 +214,80 @@ class CacheManager:
         transcript: str,
         fmt: str = 'txt',
         model: str | None = None,
+        ttl_days: int = 30,
     ) -> None:
         """Store a transcript in the cache."""
-        _init_db(self._db)
-        conn = sqlite3.connect(self._db)
-        conn.execute(
-            '''INSERT OR REPLACE INTO transcripts
-               (video_id, url, title, transcript, format, model)
-               VALUES (?, ?, ?, ?, ?, ?)''',
-            (video_id, url, title, transcript, fmt, model),
-        )
-        conn.commit()
-        conn.close()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                '''INSERT OR REPLACE INTO transcripts
+                   (video_id, url, title, transcript, format, model, expires_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (video_id, url, title, _pack(transcript), fmt, model,
+                 int(time.time()) + ttl_days * 86400),
+            )
+
+    @staticmethod
+    def _report_put(future: Future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            print(f"Warning: background cache write failed: {exc}", file=sys.stderr)
+
+    def put_async(self, *args: Any, **kwargs: Any) -> None:
+        """Store a transcript from a background thread.
+
+        Lets the CLI print its final status without waiting on the
+        compress + insert; failures are logged via a done-callback instead
+        of vanishing inside the future.
+        """
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='cache-writer'
+                )
+        self._writer.submit(self.put, *args, **kwargs).add_done_callback(self._report_put)
+
+    def put_many(
+        self,
+        rows: list[tuple[str, str, str, str, str, str | None]],
+        ttl_days: int = 30,
+    ) -> None:
+        """Store several transcripts in one transaction (one fsync, not N)."""
+        if not rows:
+            return
+        expires_at = int(time.time()) + ttl_days * 86400
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(
+                '''INSERT OR REPLACE INTO transcripts
+                   (video_id, url, title, transcript, format, model, expires_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                [(vid, url, title, _pack(text), fmt, model, expires_at)
+                 for vid, url, title, text, fmt, model in rows],
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
 
     def clear(self) -> int:
         """Delete all cached entries. Returns number of rows deleted."""
         if not self._db.exists():
             return 0
-        conn = sqlite3.connect(self._db)
-        cursor = conn.execute('DELETE FROM transcripts')
-        count = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return count
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute('DELETE FROM transcripts')
+            return cursor.rowcount
 
     def stats(self) -> dict[str, Any]:
         """Return cache statistics."""
         if not self._db.exists():
             return {'count': 0, 'size_mb': 0.0, 'oldest': None, 'newest': None}
-        conn = sqlite3.connect(self._db)
-        cursor = conn.execute(
+        cursor = self._connect().execute(
             'SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM transcripts'
         )
         row = cursor.fetchone()
-        conn.close()
         size_mb = self._db.stat().st_size / (1024 * 1024) if self._db.exists() else 0.0
         return {
             'count': row[0] or 0,
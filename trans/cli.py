@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import atexit
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 import typer
 
@@ -14,12 +17,16 @@ from . import __version__
 from .cache import CacheManager
 from .config import Config, SETTABLE_KEYS, load_config, set_config_value, get_config_path
 from .diarizer import HAS_PYANNOTE, get_hf_token, run_diarization
+from .diarizer import warm_up as diarizer_warm_up
 from .downloader import download_audio, extract_native_captions, get_video_info
 from .formatter import write_output
 from .transcriber import HAS_FASTER_WHISPER, TranscriptionEngine, extract_audio_from_video
 from .utils import (
-    OUTPUT_FORMATS,
-    WHISPER_MODELS,
+    OUTPUT_FORMATS_HELP,
+    OUTPUT_FORMATS_SET,
+    WHISPER_MODELS_HELP,
+    WHISPER_MODELS_SET,
+    assign_speakers_to_segments,
     get_video_id,
     is_local_file,
     is_audio_file,
@@ -32,6 +39,22 @@ try:
 except ImportError:
     HAS_PYPERCLIP = False
 
+# Model warm-up runs here while the audio download is in flight, so the
+# Whisper (and pyannote) load costs max(download, load) instead of the sum.
+_warm_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='model-warmup')
+atexit.register(_warm_pool.shutdown)
+
+# When output is piped or redirected (batch runs into a log, shell capture),
+# widen stdout's buffer so the many small status lines coalesce into few
+# writes instead of one syscall each. Interactive terminals keep line
+# buffering for immediate feedback.
+if not sys.stdout.isatty():
+    try:
+        sys.stdout = open(1, 'w', buffering=65536, closefd=False)
+        atexit.register(sys.stdout.flush)
+    except OSError:
+        pass
+
 app = typer.Typer(
     name="trans",
     help="Transcribe YouTube, TikTok, Twitch videos and local audio/video files.",
@@ -77,6 +100,12 @@ def _copy_to_clipboard(text: str, quiet: bool) -> None:
             typer.echo(f"⚠️  Clipboard copy failed: {e}")
 
 
+@lru_cache(maxsize=1)
+def _run_timestamp() -> str:
+    """One timestamp per process, so every file in a batch run shares it."""
+    return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+
 def _output_base(
     title: str,
     output: str | None,
@@ -88,8 +117,7 @@ def _output_base(
         return output
     safe = sanitize_filename(title)
     if timestamp:
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe = f"{safe}_{ts}"
+        safe = f"{safe}_{_run_timestamp()}"
     if output_dir:
         return str(output_dir / safe)
     if config.output_dir:
@@ -104,6 +132,60 @@ def _resolve(cli_val, config_val, default):
     return config_val if config_val else default
 
 
+def _transcribe_segments(
+    audio_file: str,
+    *,
+    engine: TranscriptionEngine,
+    language: str | None,
+    quiet: bool,
+    translate: bool,
+    diarize: bool,
+    num_speakers: int | None,
+    total_duration: float | None = None,
+):
+    """Transcribe, optionally with speaker labels.
+
+    Whisper and pyannote hold independent weights and both release the GIL
+    in their native cores, so with diarization enabled the two passes over
+    the audio run concurrently instead of back to back.
+    """
+    if not diarize:
+        return engine.transcribe(
+            audio_file, language=language or None, quiet=quiet, translate=translate,
+            total_duration=total_duration,
+        )
+
+    hf_token = get_hf_token()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f_tx = pool.submit(
+            engine.transcribe,
+            audio_file, language=language or None, quiet=quiet, translate=translate,
+            total_duration=total_duration,
+        )
+        # Diarization runs quiet: its mid-run prints would interleave with
+        # the Whisper progress line. The speaker count is reported below,
+        # after both futures have joined.
+        f_dz = pool.submit(run_diarization, audio_file, hf_token, num_speakers, True)
+        segments, info_dict = f_tx.result()
+        try:
+            diar_segs = f_dz.result()
+            segments = assign_speakers_to_segments(segments, diar_segs)
+            if not quiet:
+                n_speakers = len({d['speaker'] for d in diar_segs})
+                typer.echo(f"  Detected {n_speakers} speaker(s)")
+        except Exception as e:
+            if not quiet:
+                typer.echo(f"  Warning: Diarization failed: {e}")
+                typer.echo("  Continuing without speaker labels...")
+    return segments, info_dict
+
+
+def _output_paths(out_base: str) -> dict[str, Path]:
+    """Build every candidate output path once, instead of re-concatenating
+    the base string in each branch that touches a file."""
+    return {ext: Path(f"{out_base}.{ext}") for ext in ('txt', 'srt', 'vtt', 'json')}
+
+
 # ---------------------------------------------------------------------------
 # URL processing
 # ---------------------------------------------------------------------------
@@ -129,25 +211,30 @@ def _process_url(
     engine: TranscriptionEngine,
     cache: CacheManager,
     config: Config,
+    predownloaded: str | None = None,
+    pending_writes: list[tuple[str, str, str, str, str, str | None]] | None = None,
+    clipboard_buffer: list[str] | None = None,
 ) -> bool:
     video_id = get_video_id(url)
     cookies_str = str(cookies) if cookies else None
 
     # Cache lookup
     if not no_cache:
-        cached = cache.get(video_id, fmt if fmt != 'all' else 'txt', config.cache.ttl_days)
+        cached = cache.get(video_id, fmt if fmt != 'all' else 'txt')
         if cached:
             transcript, title = cached
             if not quiet:
                 typer.echo(f"\n💾 Using cached transcript for: {title}")
             out_base = _output_base(title, output, output_dir, timestamp, config)
-            out_fmt = fmt if fmt != 'all' else 'txt'
-            out_file = f"{out_base}.{out_fmt}"
-            Path(out_file).write_text(transcript, encoding='utf-8')
+            out_file = _output_paths(out_base)[fmt if fmt != 'all' else 'txt']
+            out_file.write_text(transcript, encoding='utf-8')
             if not quiet:
                 typer.echo(f"✓ Transcript written to {out_file}")
             if clipboard:
-                _copy_to_clipboard(transcript, quiet)
+                if clipboard_buffer is not None:
+                    clipboard_buffer.append(transcript)
+                else:
+                    _copy_to_clipboard(transcript, quiet)
             return True
 
     # Fetch metadata
@@ -165,74 +252,98 @@ def _process_url(
         typer.echo(f"{'='*60}\n")
 
     # Try native captions first
-    if not force_whisper and extract_native_captions(url, out_base, fmt, quiet):
+    got_captions, transcript = (
+        extract_native_captions(url, out_base, fmt, quiet, info=info)
+        if not force_whisper
+        else (False, None)
+    )
+    if got_captions:
         if not quiet:
             typer.echo(f"\n✓ Transcription complete (native captions)")
             _print_output_files(out_base, fmt, ['txt', 'vtt'])
-        if not no_cache:
-            txt_path = Path(f"{out_base}.txt")
-            if txt_path.exists():
-                cache.put(video_id, url, video_title, txt_path.read_text(encoding='utf-8'), 'txt')
-                if not quiet:
-                    typer.echo("💾 Cached for future use")
-        if clipboard:
-            txt_path = Path(f"{out_base}.txt")
-            if txt_path.exists():
-                _copy_to_clipboard(txt_path.read_text(encoding='utf-8'), quiet)
+        if not no_cache and transcript is not None:
+            if pending_writes is not None:
+                pending_writes.append((video_id, url, video_title, transcript, 'txt', None))
+            else:
+                cache.put_async(video_id, url, video_title,
+                                transcript, 'txt', ttl_days=config.cache.ttl_days)
+            if not quiet:
+                typer.echo("💾 Cached for future use")
+        if clipboard and transcript is not None:
+            if clipboard_buffer is not None:
+                clipboard_buffer.append(transcript)
+            else:
+                _copy_to_clipboard(transcript, quiet)
         return True
 
-    # Download + Whisper
-    audio_file = f"{out_base}.audio.mp3"
+    # Download + Whisper. Audio kept for the user stays mp3; throwaway
+    # intermediates go straight to 16 kHz mono WAV for Whisper.
+    audio_codec = 'mp3' if keep_audio else 'wav'
+    audio_file = f"{out_base}.audio.{audio_codec}"
     try:
-        if not quiet:
-            typer.echo("→ Downloading audio...")
-        final_audio = download_audio(url, audio_file, cookies=cookies_str, quiet=quiet)
-
-        segments, info_dict = engine.transcribe(final_audio, language=language or None, quiet=quiet, translate=translate)
-
-        if diarize:
-            hf_token = get_hf_token()
-            try:
-                diar_segs = run_diarization(final_audio, hf_token, num_speakers, quiet)
-                from .utils import assign_speakers_to_segments
-                segments = assign_speakers_to_segments(segments, diar_segs)
-            except Exception as e:
-                if not quiet:
-                    typer.echo(f"  Warning: Diarization failed: {e}")
-                    typer.echo("  Continuing without speaker labels...")
-
-        created = write_output(segments, out_base, fmt, info=info_dict, diarized=diarize)
-
-        if not keep_audio and Path(final_audio).exists():
-            os.remove(final_audio)
-        elif keep_audio and not quiet:
+        if predownloaded and Path(predownloaded).exists():
+            final_audio = predownloaded
+        else:
+            # Start model loads now; they finish while yt-dlp downloads.
+            warm_futures = [_warm_pool.submit(engine.warm_up)]
+            if diarize:
+                warm_futures.append(
+                    _warm_pool.submit(diarizer_warm_up, get_hf_token())
+                )
+            if not quiet:
+                typer.echo("→ Downloading audio...")
+            final_audio = download_audio(
+                url, audio_file, cookies=cookies_str, quiet=quiet, codec=audio_codec,
+                info=info,
+            )
+            for f in warm_futures:
+                f.result()
+
+        # yt-dlp metadata already carries the duration; passing it along
+        # saves transcribe() an ffprobe spawn on the downloaded file.
+        segments, info_dict = _transcribe_segments(
+            final_audio,
+            engine=engine,
+            language=language,
+            quiet=quiet,
+            translate=translate,
+            diarize=diarize,
+            num_speakers=num_speakers,
+            total_duration=float(duration) if duration else None,
+        )
+
+        created, transcript = write_output(segments, out_base, fmt, info=info_dict, diarized=diarize)
+
+        if not keep_audio:
+            Path(final_audio).unlink(missing_ok=True)
+        elif not quiet:
             typer.echo(f"  Audio saved: {final_audio}")
 
         if not quiet:
             typer.echo(f"\n✓ Transcription complete (Whisper)")
-            for p in created:
-                if p.exists():
-                    typer.echo(f"  → {p} ({p.stat().st_size} bytes)")
-
-        if not no_cache:
-            txt_path = Path(f"{out_base}.txt")
-            if txt_path.exists():
-                cache.put(video_id, url, video_title, txt_path.read_text(encoding='utf-8'), 'txt', model)
-                if not quiet:
-                    typer.echo("💾 Cached for future use")
-
-        if clipboard:
-            txt_path = Path(f"{out_base}.txt")
-            if txt_path.exists():
-                _copy_to_clipboard(txt_path.read_text(encoding='utf-8'), quiet)
+            _print_created_files(created)
+
+        if not no_cache and transcript is not None:
+            if pending_writes is not None:
+                pending_writes.append((video_id, url, video_title, transcript, 'txt', model))
+            else:
+                cache.put_async(video_id, url, video_title, transcript, 'txt',
+                                model, ttl_days=config.cache.ttl_days)
+            if not quiet:
+                typer.echo("💾 Cached for future use")
+
+        if clipboard and transcript is not None:
+            if clipboard_buffer is not None:
+                clipboard_buffer.append(transcript)
+            else:
+                _copy_to_clipboard(transcript, quiet)
 
         return True
 
     except Exception as e:
         if not quiet:
             typer.echo(f"✗ Error during transcription: {e}")
-        if Path(audio_file).exists():
-            os.remove(audio_file)
+        Path(audio_file).unlink(missing_ok=True)
         return False
 
 
@@ -256,6 +367,7 @@ def _process_local(
     translate: bool,
     engine: TranscriptionEngine,
     config: Config,
+    clipboard_buffer: list[str] | None = None,
 ) -> bool:
     fp = Path(filepath)
     if not fp.exists():
@@ -286,36 +398,36 @@ def _process_local(
     temp_audio = None
 
     if not is_audio_file(str(fp)):
-        temp_audio = f"{out_base}.temp_audio.mp3"
-        if not extract_audio_from_video(str(fp), temp_audio, quiet):
+        temp_audio = extract_audio_from_video(str(fp), f"{out_base}.temp_audio.wav", quiet)
+        if not temp_audio:
             return False
         audio_file = temp_audio
 
     try:
-        segments, info_dict = engine.transcribe(audio_file, language=language or None, quiet=quiet, translate=translate)
-
-        if diarize:
-            hf_token = get_hf_token()
-            try:
-                diar_segs = run_diarization(audio_file, hf_token, num_speakers, quiet)
-                from .utils import assign_speakers_to_segments
-                segments = assign_speakers_to_segments(segments, diar_segs)
-            except Exception as e:
-                if not quiet:
-                    typer.echo(f"  Warning: Diarization failed: {e}")
-
-        created = write_output(segments, out_base, fmt, info=info_dict, diarized=diarize)
+        # Reuse the duration probed above — the extracted audio runs the
+        # same length as the source, so transcribe() can skip its ffprobe.
+        segments, info_dict = _transcribe_segments(
+            audio_file,
+            engine=engine,
+            language=language,
+            quiet=quiet,
+            translate=translate,
+            diarize=diarize,
+            num_speakers=num_speakers,
+            total_duration=duration if duration else None,
+        )
+
+        created, transcript = write_output(segments, out_base, fmt, info=info_dict, diarized=diarize)
 
         if not quiet:
             typer.echo(f"\n✓ Transcription complete")
-            for p in created:
-                if p.exists():
-                    typer.echo(f"  → {p} ({p.stat().st_size} bytes)")
+            _print_created_files(created)
 
-        if clipboard:
-            txt_path = Path(f"{out_base}.txt")
-            if txt_path.exists():
-                _copy_to_clipboard(txt_path.read_text(encoding='utf-8'), quiet)
+        if clipboard and transcript is not None:
+            if clipboard_buffer is not None:
+                clipboard_buffer.append(transcript)
+            else:
+                _copy_to_clipboard(transcript, quiet)
 
         return True
 
@@ -324,16 +436,33 @@ def _process_local(
             typer.echo(f"✗ Error during transcription: {e}")
         return False
     finally:
-        if temp_audio and Path(temp_audio).exists():
-            os.remove(temp_audio)
+        if temp_audio:
+            Path(temp_audio).unlink(missing_ok=True)
+
+
+def _print_created_files(created: list[Path]) -> None:
+    # One stat() per file does both the existence check and the size
+    for p in created:
+        try:
+            size = p.stat().st_size
+        except OSError:
+            continue
+        typer.echo(f"  → {p} ({size} bytes)")
 
 
 def _print_output_files(out_base: str, fmt: str, extras: list[str]) -> None:
     formats = ([fmt] if fmt != 'all' else extras)
+    # One scandir snapshot instead of a stat() per candidate format
+    out_dir = os.path.dirname(out_base) or '.'
+    stem = os.path.basename(out_base)
+    try:
+        with os.scandir(out_dir) as it:
+            present = {e.name for e in it}
+    except OSError:
+        present = set()
     for ext in formats:
-        p = Path(f"{out_base}.{ext}")
-        if p.exists():
-            typer.echo(f"  → {p}")
+        if f"{stem}.{ext}" in present:
+            typer.echo(f"  → {Path(out_dir) / f'{stem}.{ext}'}")
 
 
 # ---------------------------------------------------------------------------
@@ -345,9 +474,9 @@ def transcribe(
     inputs: list[str] = typer.Argument(..., help="Video/audio URL(s) or local file path(s)"),
     output: str = typer.Option(None, "-o", "--output", help="Output base path (no extension). Single input only."),
     output_dir: Path = typer.Option(None, "--output-dir", help="Directory for output files."),
-    model: str = typer.Option(None, "-m", "--model", help=f"Whisper model: {', '.join(WHISPER_MODELS)}"),
+    model: str = typer.Option(None, "-m", "--model", help=f"Whisper model: {WHISPER_MODELS_HELP}"),
     language: str = typer.Option(None, "-l", "--language", help="Language code (e.g. en, es). Auto-detect if unset."),
-    format: str = typer.Option(None, "-f", "--format", help=f"Output format: {', '.join(OUTPUT_FORMATS)}"),
+    format: str = typer.Option(None, "-f", "--format", help=f"Output format: {OUTPUT_FORMATS_HELP}"),
     clipboard: bool = typer.Option(None, "-c", "--clipboard", help="Copy transcript to clipboard."),
     keep_audio: bool = typer.Option(False, "-k", "--keep-audio", help="Keep downloaded audio file."),
     timestamp: bool = typer.Option(False, "-t", "--timestamp", help="Add timestamp to output filename."),
@@ -358,6 +487,10 @@ def transcribe(
     diarize: bool = typer.Option(False, "-d", "--diarize", help="Enable speaker diarization (requires pyannote-audio)."),
     num_speakers: int = typer.Option(None, "--num-speakers", help="Number of speakers (helps diarization accuracy)."),
     translate: bool = typer.Option(False, "--translate", help="Translate non-English audio to English."),
+    jobs: int = typer.Option(3, "-j", "--jobs", help="Parallel download workers for batch URL runs."),
+    batch_size: int = typer.Option(0, "--batch-size", help="Whisper batched-inference size (0 = off; try 8-16 on CPU, 16-32 on GPU)."),
+    device: str = typer.Option(None, "--device", help="Whisper device (cpu, cuda). Auto-detected if unset."),
+    compute_type: str = typer.Option(None, "--compute-type", help="Whisper compute type (int8, float16, ...). Auto-selected if unset."),
 ) -> None:
     """Transcribe video/audio URLs or local files to text."""
 
@@ -371,11 +504,11 @@ def transcribe(
     eff_quiet = quiet if quiet is not None else cfg.quiet
 
     # Validate
-    if eff_model not in WHISPER_MODELS:
-        typer.echo(f"✗ Invalid model '{eff_model}'. Choose from: {', '.join(WHISPER_MODELS)}")
+    if eff_model not in WHISPER_MODELS_SET:
+        typer.echo(f"✗ Invalid model '{eff_model}'. Choose from: {WHISPER_MODELS_HELP}")
         raise typer.Exit(1)
-    if eff_format not in OUTPUT_FORMATS:
-        typer.echo(f"✗ Invalid format '{eff_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+    if eff_format not in OUTPUT_FORMATS_SET:
+        typer.echo(f"✗ Invalid format '{eff_format}'. Choose from: {OUTPUT_FORMATS_HELP}")
         raise typer.Exit(1)
     if output and len(inputs) > 1:
         typer.echo("✗ -o/--output can only be used with a single input")
@@ -399,7 +532,9 @@ def transcribe(
             raise typer.Exit(1)
 
     cache = CacheManager()
-    engine = TranscriptionEngine(eff_model)
+    engine = TranscriptionEngine(
+        eff_model, batch_size=batch_size, device=device, compute_type=compute_type
+    )
 
     urls = [i for i in inputs if not is_local_file(i)]
     files = [i for i in inputs if is_local_file(i)]
@@ -407,28 +542,43 @@ def transcribe(
     success_count = 0
     fail_count = 0
 
-    # Download all URLs concurrently (up to 3), then transcribe sequentially
-    downloaded: dict[str, str] = {}  # url -> audio_path
-    if urls and not any(is_local_file(u) for u in urls):
-        # Pre-download in parallel for batch URL runs
-        if len(urls) > 1:
-            def _download(url):
-                vid_id = get_video_id(url)
-                info = get_video_info(url, cookies=str(cookies) if cookies else None, quiet=eff_quiet)
-                title = info.get('title', vid_id)
-                out_b = _output_base(title, None, output_dir, timestamp, cfg)
-                audio_path = f"{out_b}.audio.mp3"
-                try:
-                    return url, download_audio(url, audio_path, cookies=str(cookies) if cookies else None, quiet=True)
-                except Exception:
-                    return url, None
-
-            with ThreadPoolExecutor(max_workers=3) as pool:
-                futures = {pool.submit(_download, u): u for u in urls}
-                for f in as_completed(futures):
-                    url, audio = f.result()
-                    if audio:
-                        downloaded[url] = audio
+    # Batch runs buffer cache rows and flush them in one transaction at the end
+    pending_writes: list[tuple[str, str, str, str, str, str | None]] | None = (
+        [] if len(inputs) > 1 else None
+    )
+    # Batch runs copy once at the end instead of clobbering the clipboard N times
+    clipboard_buffer: list[str] | None = (
+        [] if eff_clipboard and len(inputs) > 1 else None
+    )
+
+    # Pipeline batch URL runs: a small worker pool downloads ahead while the
+    # main thread transcribes — Whisper already saturates the CPU/GPU, so
+    # only the network phase is parallelized. The main loop blocks on each
+    # URL's own future, not on the whole batch, so the first transcription
+    # starts as soon as the first download lands.
+    download_futures: dict[str, Any] = {}  # url -> Future[audio_path | None]
+    download_pool: ThreadPoolExecutor | None = None
+    if len(urls) > 1 and jobs > 1:
+        def _download(url):
+            vid_id = get_video_id(url)
+            # A cached transcript means no audio is needed — don't waste
+            # a download slot on it
+            if not no_cache and cache.get(
+                vid_id, eff_format if eff_format != 'all' else 'txt'
+            ):
+                return None
+            info = get_video_info(url, cookies=str(cookies) if cookies else None, quiet=eff_quiet)
+            title = info.get('title', vid_id)
+            out_b = _output_base(title, None, output_dir, timestamp, cfg)
+            codec = 'mp3' if keep_audio else 'wav'
+            audio_path = f"{out_b}.audio.{codec}"
+            try:
+                return download_audio(url, audio_path, cookies=str(cookies) if cookies else None, quiet=True, codec=codec, info=info)
+            except Exception:
+                return None
+
+        download_pool = ThreadPoolExecutor(max_workers=min(jobs, len(urls)))
+        download_futures = {u: download_pool.submit(_download, u) for u in urls}
 
     for inp in inputs:
         try:
@@ -448,6 +598,7 @@ def transcribe(
                     translate=translate,
                     engine=engine,
                     config=cfg,
+                    clipboard_buffer=clipboard_buffer,
                 )
             else:
                 ok = _process_url(
@@ -470,6 +621,11 @@ def transcribe(
                     engine=engine,
                     cache=cache,
                     config=cfg,
+                    predownloaded=(
+                        download_futures[inp].result() if inp in download_futures else None
+                    ),
+                    pending_writes=pending_writes,
+                    clipboard_buffer=clipboard_buffer,
                 )
             if ok:
                 success_count += 1
@@ -478,11 +634,26 @@ def transcribe(
         except KeyboardInterrupt:
             typer.echo("\n\n⚠️  Interrupted by user")
             raise typer.Exit(1)
+        except typer.Exit:
+            # Deliberate exits (bad flags, fatal setup errors) end the run;
+            # only per-input failures should be swallowed and counted.
+            raise
         except Exception as e:
+            # Broad by design: one flaky download or codec error must not
+            # kill the rest of a batch.
             if not eff_quiet:
                 typer.echo(f"✗ Unexpected error: {e}")
             fail_count += 1
 
+    if download_pool is not None:
+        download_pool.shutdown(wait=False)
+
+    if pending_writes:
+        cache.put_many(pending_writes, ttl_days=cfg.cache.ttl_days)
+
+    if clipboard_buffer:
+        _copy_to_clipboard('\n\n'.join(clipboard_buffer), eff_quiet)
+
     if len(inputs) > 1 and not eff_quiet:
         typer.echo(f"\n{'='*60}")
         typer.echo(f"Summary: {success_count} succeeded, {fail_count} failed")
@@ -501,6 +672,7 @@ def cache_clear() -> None:
     """Delete all cached transcripts."""
     cache = CacheManager()
     count = cache.clear()
+    cache.maybe_vacuum(size_mb_threshold=1.0)
     typer.echo(f"✓ Cleared {count} cached transcript(s)")
 
 
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 from platformdirs import user_config_dir
@@ -44,8 +46,14 @@ class Config:
     diarization: DiarizationConfig = field(default_factory=DiarizationConfig)
 
 
+@lru_cache(maxsize=4)
 def load_config(path: Path | None = None) -> Config:
-    """Load config from TOML file, falling back to defaults."""
+    """Load config from TOML file, falling back to defaults.
+
+    Memoized per process — the Typer callback and subcommands can each ask
+    for the config, and a CLI run never outlives an on-disk edit (writers go
+    through set_config_value, which clears the cache).
+    """
     config_path = path or get_config_path()
     if not config_path.exists():
         return Config()
@@ -73,17 +81,25 @@ def load_config(path: Path | None = None) -> Config:
     )
 
 
+def _toml_str(value: str) -> str:
+    """Escape a string as a TOML basic string (JSON escaping is a subset)."""
+    return json.dumps(value)
+
+
 def save_config(config: Config, path: Path | None = None) -> None:
     """Write config to TOML file."""
     config_path = path or get_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Escaped values, assembled once and written with a single buffered call.
+    # Unescaped quotes/backslashes (Windows paths, odd tokens) used to corrupt
+    # the file, which load_config then silently discarded.
     lines = [
         "[defaults]",
-        f'model = "{config.model}"',
-        f'format = "{config.format}"',
-        f'language = "{config.language}"',
-        f'output_dir = "{config.output_dir}"',
+        f'model = {_toml_str(config.model)}',
+        f'format = {_toml_str(config.format)}',
+        f'language = {_toml_str(config.language)}',
+        f'output_dir = {_toml_str(config.output_dir)}',
         f'clipboard = {str(config.clipboard).lower()}',
         f'quiet = {str(config.quiet).lower()}',
         f'keep_audio = {str(config.keep_audio).lower()}',
@@ -92,7 +108,7 @@ def save_config(config: Config, path: Path | None = None) -> None:
         f"ttl_days = {config.cache.ttl_days}",
         "",
         "[diarization]",
-        f'hf_token = "{config.diarization.hf_token}"',
+        f'hf_token = {_toml_str(config.diarization.hf_token)}',
         "",
     ]
     config_path.write_text("\n".join(lines))
@@ -112,20 +128,22 @@ _CONFIG_KEYS: dict[str, str] = {
 }
 
 SETTABLE_KEYS = list(_CONFIG_KEYS.keys())
+SETTABLE_KEYS_HELP = ", ".join(_CONFIG_KEYS)
+
+_BOOL_KEYS = frozenset({"clipboard", "quiet", "keep_audio"})
+_INT_KEYS = frozenset({"cache.ttl_days"})
 
 
 def set_config_value(key: str, value: str, path: Path | None = None) -> Config:
     """Set a single config value by dotted key name."""
     if key not in _CONFIG_KEYS:
-        raise ValueError(f"Unknown config key: {key}. Valid keys: {SETTABLE_KEYS}")
+        raise ValueError(f"Unknown config key: {key}. Valid keys: {SETTABLE_KEYS_HELP}")
 
     config = load_config(path)
-    bool_keys = {"clipboard", "quiet", "keep_audio"}
-    int_keys = {"cache.ttl_days"}
 
-    if key in bool_keys:
+    if key in _BOOL_KEYS:
         typed_value = value.lower() in ("true", "1", "yes")
-    elif key in int_keys:
+    elif key in _INT_KEYS:
         typed_value = int(value)
     else:
         typed_value = value
@@ -138,4 +156,5 @@ def set_config_value(key: str, value: str, path: Path | None = None) -> Config:
         setattr(config.diarization, key.split(".", 1)[1], typed_value)
 
     save_config(config, path)
+    load_config.cache_clear()
     return config
@@ -2,21 +2,58 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+from functools import lru_cache
+from importlib import util as _importlib_util
 from pathlib import Path
 from typing import Any
 
 from .utils import assign_speakers_to_segments
 
+# Availability is checked without importing: pyannote drags in torch and
+# torchaudio (seconds of import time, hundreds of MB), which trans --version
+# or config subcommands should never pay for. The real import happens in
+# _load_pipeline on the first diarization call.
 try:
-    from pyannote.audio import Pipeline as DiarizationPipeline
-    HAS_PYANNOTE = True
-except ImportError:
+    HAS_PYANNOTE = _importlib_util.find_spec('pyannote.audio') is not None
+except ModuleNotFoundError:  # parent 'pyannote' namespace absent entirely
     HAS_PYANNOTE = False
 
+_DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
 
+# Loaded pipelines keyed by (model, token digest) — from_pretrained re-parses
+# configs and reloads hundreds of MB of weights, so pay that cost once per
+# process, not once per input. Sequential reuse of a pipeline is safe.
+_PIPELINE_CACHE: dict[tuple[str, str], Any] = {}
+
+
+def _load_pipeline(hf_token: str) -> Any:
+    key = (_DIARIZATION_MODEL, hashlib.sha256(hf_token.encode()).hexdigest()[:16])
+    pipeline = _PIPELINE_CACHE.get(key)
+    if pipeline is None:
+        from pyannote.audio import Pipeline as DiarizationPipeline
+        pipeline = DiarizationPipeline.from_pretrained(
+            _DIARIZATION_MODEL,
+            use_auth_token=hf_token,
+        )
+        try:
+            import torch
+            if torch.cuda.is_available():
+                pipeline.to(torch.device('cuda'))
+        except ImportError:
+            pass
+        _PIPELINE_CACHE[key] = pipeline
+    return pipeline
+
+
+@lru_cache(maxsize=1)
 def get_hf_token() -> str | None:
-    """Get HuggingFace token from environment or cache."""
+    """Get HuggingFace token from environment or cache.
+
+    Memoized: batch runs call this per input, and the miss path stats and
+    reads ~/.cache/huggingface/token each time.
+    """
     token = os.environ.get('HF_TOKEN') or os.environ.get('HUGGING_FACE_HUB_TOKEN')
     if token:
         return token
@@ -28,6 +65,20 @@ def get_hf_token() -> str | None:
     return None
 
 
+def warm_up(hf_token: str | None) -> None:
+    """Load the diarization pipeline eagerly, swallowing errors.
+
+    run_diarization reports real failures to the user; this just lets the
+    load overlap a download when submitted to a background thread.
+    """
+    if not HAS_PYANNOTE or not hf_token:
+        return
+    try:
+        _load_pipeline(hf_token)
+    except Exception:
+        pass
+
+
 def run_diarization(
     audio_file: str,
     hf_token: str,
@@ -53,10 +104,7 @@ def run_diarization(
     if not quiet:
         print("  Loading diarization model...")
 
-    pipeline = DiarizationPipeline.from_pretrained(
-        "pyannote/speaker-diarization-3.1",
-        use_auth_token=hf_token,
-    )
+    pipeline = _load_pipeline(hf_token)
 
     if not quiet:
         print("  Running speaker diarization...")
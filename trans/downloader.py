@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
 from typing import Any, Callable
 
 import yt_dlp
+from platformdirs import user_cache_dir
 
-from .utils import is_tiktok_url
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from .utils import get_video_id, is_tiktok_url
+
+# Matches VTT/SRT structural lines (header, metadata, cue numbers, timing lines)
+# that should be dropped when flattening captions to plain text. Bytes-mode so
+# the filter runs without decoding the subtitle text at all.
+_VTT_NONTEXT = re.compile(rb'^(?:WEBVTT|Kind:|NOTE|\d+$)|-->')
 
 
 def _base_opts(url: str, cookies: str | None, quiet: bool) -> dict[str, Any]:
@@ -22,13 +36,40 @@ def _base_opts(url: str, cookies: str | None, quiet: bool) -> dict[str, Any]:
     return opts
 
 
+# Metadata fetches go over the network, so memoize them to disk for a day —
+# re-runs and batch repeats skip yt-dlp entirely.
+_INFO_TTL_SECONDS = 86400
+
+
+def _info_cache_path(url: str) -> Path:
+    return Path(user_cache_dir("trans")) / "info" / f"{get_video_id(url)}.json"
+
+
 def get_video_info(url: str, cookies: str | None = None, quiet: bool = False) -> dict[str, Any]:
     """Fetch video metadata without downloading."""
+    cache_path = _info_cache_path(url)
+    try:
+        if time.time() - cache_path.stat().st_mtime < _INFO_TTL_SECONDS:
+            raw = cache_path.read_bytes()
+            # Both accept bytes directly, skipping a separate utf-8 decode pass
+            return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    except (OSError, ValueError):
+        pass
+
     opts = _base_opts(url, cookies, quiet)
     try:
         with yt_dlp.YoutubeDL(opts) as ydl:
             info = ydl.extract_info(url, download=False)
-            return info or {}
+            info = ydl.sanitize_info(info) or {}
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                if HAS_ORJSON:
+                    cache_path.write_bytes(orjson.dumps(info))
+                else:
+                    cache_path.write_text(json.dumps(info), encoding='utf-8')
+            except (OSError, TypeError):
+                pass
+            return info
     except yt_dlp.utils.DownloadError as e:
         error_msg = str(e)
         if is_tiktok_url(url) and ('IP address is blocked' in error_msg or 'blocked' in error_msg.lower()):
@@ -54,24 +95,42 @@ def download_audio(
     cookies: str | None = None,
     quiet: bool = False,
     progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    codec: str = 'mp3',
+    info: dict[str, Any] | None = None,
 ) -> str:
-    """Download audio from URL. Returns the final file path."""
+    """
+    Download audio from URL. Returns the final file path.
+
+    codec='wav' extracts straight to Whisper's native 16 kHz mono PCM,
+    skipping a lossy mp3 encode that would only be decoded again.
+
+    Passing the metadata dict from get_video_info skips the second
+    extractor run (and its network round-trips) before the download.
+    """
     opts = _base_opts(url, cookies, quiet)
     opts.update({
         'format': 'bestaudio/best',
-        'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3'}],
+        'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': codec}],
         'outtmpl': str(output_path),
     })
+    if codec == 'wav':
+        opts['postprocessor_args'] = ['-ar', '16000', '-ac', '1']
     if progress_callback:
         opts['progress_hooks'] = [progress_callback]
 
     with yt_dlp.YoutubeDL(opts) as ydl:
-        ydl.download([url])
+        if info is not None:
+            try:
+                ydl.process_ie_result(dict(info), download=True)
+            except Exception:
+                ydl.download([url])
+        else:
+            ydl.download([url])
 
-    # yt-dlp appends .mp3 when post-processing
+    # yt-dlp appends the codec extension when post-processing
     final = str(output_path)
-    if not final.endswith('.mp3'):
-        final = final + '.mp3'
+    if not final.endswith(f'.{codec}'):
+        final = f'{final}.{codec}'
     if Path(final).exists():
         return final
     # Sometimes the path is left as-is
@@ -83,12 +142,25 @@ def extract_native_captions(
     output_path: str,
     output_format: str = 'txt',
     quiet: bool = False,
-) -> bool:
+    info: dict[str, Any] | None = None,
+) -> tuple[bool, str | None]:
     """
     Attempt to extract auto-generated captions.
 
-    Returns True if a caption file was created.
+    When the metadata dict from get_video_info is passed in, caption
+    availability is read from it directly, so a miss costs nothing instead
+    of a doomed yt-dlp download attempt.
+
+    Returns (created, transcript) — transcript is the flattened plain text
+    when a .txt was produced, handed back so callers don't re-read the file.
     """
+    if info is not None:
+        has_en = 'en' in (info.get('subtitles') or {}) or 'en' in (
+            info.get('automatic_captions') or {}
+        )
+        if not has_en:
+            return False, None
+
     if not quiet:
         print("→ Checking for native captions...")
 
@@ -107,42 +179,44 @@ def extract_native_captions(
 
     try:
         with yt_dlp.YoutubeDL(opts) as ydl:
-            ydl.download([url])
+            if info is not None:
+                # Reuse the already-extracted info dict so the subtitle
+                # download doesn't run the extractor a second time.
+                try:
+                    ydl.process_ie_result(dict(info), download=True)
+                except Exception:
+                    ydl.download([url])
+            else:
+                ydl.download([url])
     except Exception:
-        return False
+        return False, None
 
     caption_file = f"{output_path}.en.{sub_format}"
     if not os.path.exists(caption_file):
-        return False
+        return False, None
 
-    # Convert to plain text if requested
+    # Convert to plain text if requested. The flattened text is kept in
+    # memory and returned — callers cache/copy it anyway, so building it
+    # here saves them a full re-read of the .txt.
+    transcript = None
     if output_format in ('txt', 'all'):
-        with open(caption_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        text_lines = []
-        for line in lines:
-            line = line.strip()
-            if (
-                line
-                and not line.startswith('WEBVTT')
-                and not line.startswith('Kind:')
-                and '-->' not in line
-                and not line.isdigit()
-                and not line.startswith('NOTE')
-            ):
-                text_lines.append(line)
-
         txt_output = f"{output_path}.txt"
-        with open(txt_output, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(text_lines))
+        parts: list[bytes] = []
+        with open(caption_file, 'rb') as fin:
+            for line in fin:
+                line = line.strip()
+                if line and not _VTT_NONTEXT.search(line):
+                    parts.append(line)
+        data = b'\n'.join(parts) + b'\n' if parts else b''
+        Path(txt_output).write_bytes(data)
+        transcript = data.decode('utf-8')
 
     # Clean up or rename caption file
     if output_format not in ('all', sub_format):
-        os.remove(caption_file)
+        Path(caption_file).unlink(missing_ok=True)
     else:
         final_name = f"{output_path}.{sub_format}"
         if caption_file != final_name:
-            os.rename(caption_file, final_name)
+            os.replace(caption_file, final_name)
 
-    return True
+    return True, transcript
@@ -6,6 +6,12 @@ import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .utils import format_speaker_label, format_timestamp_srt, format_timestamp_vtt
 
 
@@ -15,10 +21,15 @@ def write_output(
     fmt: str,
     info: dict[str, Any] | None = None,
     diarized: bool = False,
-) -> list[Path]:
+) -> tuple[list[Path], str | None]:
     """
     Write transcript segments to one or more output files.
 
+    The text formats share one pass over the segments: speaker labels and
+    timestamps are computed once per segment and emitted into whichever
+    format bodies are requested, so fmt='all' no longer re-walks the list
+    (and re-derives the same strings) per format.
+
     Args:
         segments: List of {'start', 'end', 'text'} dicts (may include 'speaker').
         output_base: Base path without extension.
@@ -27,74 +38,93 @@ def write_output(
         diarized: Whether segments contain speaker labels.
 
     Returns:
-        List of Path objects for created files.
+        (created, txt_content) — the Paths of created files, and the plain-text
+        transcript when one was written (callers cache/copy it, so handing it
+        back saves them re-reading the file).
     """
-    has_speakers = diarized and segments and 'speaker' in segments[0]
+    has_speakers = bool(diarized and segments and 'speaker' in segments[0])
     created: list[Path] = []
+    txt_content: str | None = None
 
-    if fmt in ('txt', 'all'):
-        path = Path(f"{output_base}.txt")
-        with open(path, 'w', encoding='utf-8') as f:
+    want_txt = fmt in ('txt', 'all')
+    want_srt = fmt in ('srt', 'all')
+    want_vtt = fmt in ('vtt', 'all')
+
+    txt_parts: list[str] = []
+    srt_cues: list[str] = []
+    vtt_cues: list[str] = ["WEBVTT\n\n"]
+
+    if want_txt or want_srt or want_vtt:
+        # Labels resolved once per distinct speaker for this call; the loop
+        # below then pays a plain dict hit per segment.
+        labels: dict[str, str] = {}
+        current_speaker = None
+        for i, seg in enumerate(segments, 1):
+            text = seg['text']
+            speaker = None
             if has_speakers:
-                current_speaker = None
-                for seg in segments:
-                    speaker = format_speaker_label(seg.get('speaker', 'UNKNOWN'))
-                    if speaker != current_speaker:
-                        if current_speaker is not None:
-                            f.write('\n')
-                        f.write(f"[{speaker}]\n")
-                        current_speaker = speaker
-                    f.write(seg['text'] + '\n')
-            else:
-                for seg in segments:
-                    f.write(seg['text'] + '\n')
+                spk_id = seg.get('speaker', 'UNKNOWN')
+                speaker = labels.get(spk_id)
+                if speaker is None:
+                    speaker = labels[spk_id] = format_speaker_label(spk_id)
+            if want_txt:
+                if speaker is not None and speaker != current_speaker:
+                    if current_speaker is not None:
+                        txt_parts.append('')
+                    txt_parts.append(f"[{speaker}]")
+                    current_speaker = speaker
+                txt_parts.append(text)
+            if want_srt:
+                start_time = format_timestamp_srt(seg['start'])
+                end_time = format_timestamp_srt(seg['end'])
+                cue_text = f"[{speaker}] {text}" if speaker is not None else text
+                srt_cues.append(f"{i}\n{start_time} --> {end_time}\n{cue_text}\n\n")
+            if want_vtt:
+                start_time = format_timestamp_vtt(seg['start'])
+                end_time = format_timestamp_vtt(seg['end'])
+                if speaker is not None:
+                    vtt_cues.append(f"{start_time} --> {end_time}\n<v {speaker}>{text}\n\n")
+                else:
+                    vtt_cues.append(f"{start_time} --> {end_time}\n{text}\n\n")
+
+    if want_txt:
+        path = Path(f"{output_base}.txt")
+        txt_content = '\n'.join(txt_parts) + '\n' if txt_parts else ''
+        path.write_text(txt_content, encoding='utf-8')
         created.append(path)
 
-    if fmt in ('srt', 'all'):
+    if want_srt:
         path = Path(f"{output_base}.srt")
-        with open(path, 'w', encoding='utf-8') as f:
-            for i, seg in enumerate(segments, 1):
-                start_time = format_timestamp_srt(seg['start'])
-                end_time = format_timestamp_srt(seg['end'])
-                text = seg['text']
-                if has_speakers:
-                    speaker = format_speaker_label(seg.get('speaker', 'UNKNOWN'))
-                    text = f"[{speaker}] {text}"
-                f.write(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+        path.write_text(''.join(srt_cues), encoding='utf-8')
         created.append(path)
 
-    if fmt in ('vtt', 'all'):
+    if want_vtt:
         path = Path(f"{output_base}.vtt")
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write("WEBVTT\n\n")
-            for seg in segments:
-                start_time = format_timestamp_vtt(seg['start'])
-                end_time = format_timestamp_vtt(seg['end'])
-                text = seg['text']
-                if has_speakers:
-                    speaker = format_speaker_label(seg.get('speaker', 'UNKNOWN'))
-                    f.write(f"{start_time} --> {end_time}\n<v {speaker}>{text}\n\n")
-                else:
-                    f.write(f"{start_time} --> {end_time}\n{text}\n\n")
+        path.write_text(''.join(vtt_cues), encoding='utf-8')
         created.append(path)
 
     if fmt in ('json', 'all'):
         path = Path(f"{output_base}.json")
-        with open(path, 'w', encoding='utf-8') as f:
-            output_data: dict[str, Any] = {
-                'diarization': has_speakers,
-                'segments': segments,
-            }
-            if info:
-                output_data['language'] = info.get('language', '')
-                output_data['language_probability'] = info.get('language_probability', 0)
-                output_data['duration'] = info.get('duration', 0)
-            if has_speakers:
-                speakers = set(seg.get('speaker') for seg in segments)
-                output_data['speakers'] = [
-                    format_speaker_label(s) for s in sorted(speakers)
-                ]
-            json.dump(output_data, f, indent=2)
+        output_data: dict[str, Any] = {
+            'diarization': has_speakers,
+            'segments': segments,
+        }
+        if info:
+            output_data['language'] = info.get('language', '')
+            output_data['language_probability'] = info.get('language_probability', 0)
+            output_data['duration'] = info.get('duration', 0)
+        if has_speakers:
+            speakers = set(seg.get('speaker') for seg in segments)
+            output_data['speakers'] = [
+                format_speaker_label(s) for s in sorted(speakers)
+            ]
+        if HAS_ORJSON:
+            # Rust encoder emits indented bytes directly — several times
+            # faster than stdlib json on long segment lists.
+            path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=2)
         created.append(path)
 
-    return created
+    return created, txt_content
@@ -2,69 +2,160 @@
 
 from __future__ import annotations
 
+import shutil
 import subprocess
 import sys
+from importlib import util as _importlib_util
 from pathlib import Path
 from typing import Any
 
-try:
-    from faster_whisper import WhisperModel
-    HAS_FASTER_WHISPER = True
-except ImportError:
-    HAS_FASTER_WHISPER = False
-    WhisperModel = None  # type: ignore[misc, assignment]
+# Resolve the ffmpeg tools once at import so each subprocess call execs an
+# absolute path instead of re-searching PATH.
+_FFMPEG = shutil.which('ffmpeg') or 'ffmpeg'
+_FFPROBE = shutil.which('ffprobe') or 'ffprobe'
+
+# Availability is checked without importing — faster_whisper pulls in
+# ctranslate2 and friends, which non-transcribing invocations (--version,
+# config/cache subcommands) shouldn't pay for. The real import happens
+# lazily the first time a model is needed.
+HAS_FASTER_WHISPER = _importlib_util.find_spec('faster_whisper') is not None
+
+WhisperModel: Any = None
+BatchedInferencePipeline: Any = None
+
+
+def _pick_device() -> tuple[str, str]:
+    """Choose (device, compute_type): FP16 on CUDA when present, int8 CPU otherwise."""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return 'cuda', 'float16'
+    except Exception:
+        pass
+    return 'cpu', 'int8'
+
+
+def _load_faster_whisper() -> None:
+    global WhisperModel, BatchedInferencePipeline
+    if WhisperModel is not None:
+        return
+    from faster_whisper import WhisperModel as _WhisperModel
+    WhisperModel = _WhisperModel
+    try:
+        from faster_whisper import BatchedInferencePipeline as _Batched
+        BatchedInferencePipeline = _Batched
+    except ImportError:  # older faster-whisper without batched inference
+        pass
 
 
 def get_file_duration(audio_file: str) -> float:
     """Return duration in seconds via ffprobe, or 0 on failure."""
     try:
+        # Ask for the audio stream's duration (header-only for most
+        # containers) with the format duration as fallback, in one probe.
         result = subprocess.run(
             [
-                'ffprobe', '-v', 'error',
-                '-show_entries', 'format=duration',
+                _FFPROBE, '-v', 'error', '-nostdin', '-hide_banner',
+                '-select_streams', 'a:0',
+                '-show_entries', 'stream=duration:format=duration',
                 '-of', 'default=noprint_wrappers=1:nokey=1',
                 str(audio_file),
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        if result.stdout.strip():
-            return float(result.stdout.strip())
-    except (subprocess.CalledProcessError, ValueError):
+        # float() accepts the raw ASCII bytes — no pipe for stderr we never
+        # read, no locale decode for a numeric string.
+        for line in result.stdout.split():
+            try:
+                return float(line)
+            except ValueError:  # e.g. 'N/A' stream duration in webm
+                continue
+    except subprocess.CalledProcessError:
         pass
     return 0.0
 
 
-def extract_audio_from_video(video_path: str, output_audio: str, quiet: bool = False) -> bool:
-    """Extract audio track from a video file using ffmpeg."""
+def _probe_audio_codec(video_path: str) -> str | None:
+    """Return the first audio stream's codec name, or None on failure."""
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE, '-v', 'error', '-nostdin', '-hide_banner',
+                '-select_streams', 'a:0',
+                '-show_entries', 'stream=codec_name',
+                '-of', 'default=noprint_wrappers=1:nokey=1',
+                str(video_path),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        codec = result.stdout.strip().decode('ascii', 'replace')
+        return codec or None
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+# Audio codecs Whisper ingests directly: stream-copy instead of re-encoding.
+_COPYABLE_CODECS = {'mp3': '.mp3', 'aac': '.m4a'}
+
+
+def extract_audio_from_video(video_path: str, output_audio: str, quiet: bool = False) -> str | None:
+    """
+    Extract audio track from a video file using ffmpeg.
+
+    When the container already holds an MP3/AAC track the stream is copied
+    out untouched (no decode/encode pass — faster-whisper reads both via
+    its own FFmpeg). Otherwise the track is transcoded to 16 kHz mono PCM,
+    what Whisper resamples to anyway.
+
+    Returns the path of the extracted audio file, or None on failure.
+    """
     if not quiet:
         print("→ Extracting audio from video...")
 
+    codec = _probe_audio_codec(video_path)
+    copy_ext = _COPYABLE_CODECS.get(codec or '')
+    if copy_ext:
+        output_audio = str(Path(output_audio).with_suffix(copy_ext))
+        codec_args = ['-c:a', 'copy']
+    else:
+        codec_args = ['-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1']
+
     cmd = [
-        'ffmpeg', '-y',
+        _FFMPEG, '-y', '-nostdin', '-hide_banner', '-loglevel', 'error',
         '-i', str(video_path),
         '-vn',
-        '-acodec', 'libmp3lame',
-        '-q:a', '2',
+        *codec_args,
         str(output_audio),
     ]
 
     try:
         subprocess.run(cmd, capture_output=True, check=True)
-        return True
+        return str(output_audio)
     except subprocess.CalledProcessError as e:
         if not quiet:
             stderr = e.stderr.decode() if e.stderr else str(e)
             print(f"✗ Failed to extract audio: {stderr}")
-        return False
+        return None
 
 
 class TranscriptionEngine:
     """Lazy-loading Whisper model, reused across multiple transcriptions."""
 
-    def __init__(self, model_name: str = 'base') -> None:
+    def __init__(
+        self,
+        model_name: str = 'base',
+        batch_size: int = 0,
+        device: str | None = None,
+        compute_type: str | None = None,
+    ) -> None:
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.device = device
+        self.compute_type = compute_type
         self._model: WhisperModel | None = None
+        self._batched: BatchedInferencePipeline | None = None
 
     @property
     def model(self) -> WhisperModel:
@@ -73,41 +164,82 @@ class TranscriptionEngine:
                 raise ImportError(
                     "faster-whisper is not installed. Run: pip install faster-whisper"
                 )
-            self._model = WhisperModel(self.model_name, device="cpu", compute_type="int8")
+            _load_faster_whisper()
+            device, compute_type = _pick_device()
+            device = self.device or device
+            compute_type = self.compute_type or compute_type
+            self._model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
         return self._model
 
+    def warm_up(self) -> None:
+        """Load the model eagerly, swallowing errors.
+
+        Meant for background submission while something else (a download)
+        is in flight; transcribe() re-raises anything real on first use.
+        """
+        if not HAS_FASTER_WHISPER:
+            return
+        try:
+            self.model
+        except Exception:
+            pass
+
     def transcribe(
         self,
         audio_file: str,
         language: str | None = None,
         quiet: bool = False,
         translate: bool = False,
+        total_duration: float | None = None,
     ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
         """
         Transcribe audio file.
 
+        Callers that already know the duration (yt-dlp metadata, an earlier
+        probe of a local file) pass it via total_duration; ffprobe only runs
+        when nobody has it.
+
         Returns (segments, info) where segments is a list of
         {'start', 'end', 'text'} dicts and info contains language metadata.
         """
         if not quiet:
             print(f"  Loading {self.model_name} model...")
 
-        total_duration = get_file_duration(audio_file)
+        if total_duration is None:
+            total_duration = get_file_duration(audio_file)
 
         if not quiet:
             print("  Transcribing...")
 
         task = "translate" if translate else "transcribe"
-        segments_gen, info = self.model.transcribe(
-            audio_file,
-            language=language or None,
-            task=task,
-            beam_size=5,
-            vad_filter=False,
-        )
+        model = self.model  # triggers the lazy faster_whisper import
+        if self.batch_size > 1 and BatchedInferencePipeline is not None:
+            # Batched inference feeds several 30s windows through the
+            # encoder at once — same loaded model, better throughput.
+            if self._batched is None:
+                self._batched = BatchedInferencePipeline(model=model)
+            segments_gen, info = self._batched.transcribe(
+                audio_file,
+                language=language or None,
+                task=task,
+                beam_size=5,
+                batch_size=self.batch_size,
+            )
+        else:
+            segments_gen, info = model.transcribe(
+                audio_file,
+                language=language or None,
+                task=task,
+                beam_size=5,
+                vad_filter=False,
+            )
 
         segments_list: list[dict[str, Any]] = []
         last_percent = 0
+        # Hoist the percent math to one multiply per segment; writes (and
+        # their flushes) only happen when the displayed value changes.
+        inv = 100.0 / total_duration if total_duration > 0 else 0.0
+        show_progress = not quiet and inv > 0.0
 
         for segment in segments_gen:
             seg_data = {
@@ -117,10 +249,10 @@ class TranscriptionEngine:
             }
             segments_list.append(seg_data)
 
-            if not quiet and total_duration > 0:
-                percent = min(100, int((segment.end / total_duration) * 100))
+            if show_progress:
+                percent = min(100, int(segment.end * inv))
                 if percent != last_percent:
-                    sys.stdout.write(f"\r  Progress: {percent}%")
+                    sys.stdout.write('\r  Progress: %3d%%' % percent)
                     sys.stdout.flush()
                     last_percent = percent
 
@@ -4,103 +4,209 @@ from __future__ import annotations
 
 import hashlib
 import re
-from pathlib import Path
+from functools import lru_cache
 from typing import Any
+from urllib.parse import SplitResult, parse_qs, urlsplit
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # Supported Whisper models
 WHISPER_MODELS = ['tiny', 'base', 'small', 'medium', 'large']
+WHISPER_MODELS_SET = frozenset(WHISPER_MODELS)
+WHISPER_MODELS_HELP = ', '.join(WHISPER_MODELS)
 
 # Supported output formats
 OUTPUT_FORMATS = ['txt', 'srt', 'vtt', 'json', 'all']
+OUTPUT_FORMATS_SET = frozenset(OUTPUT_FORMATS)
+OUTPUT_FORMATS_HELP = ', '.join(OUTPUT_FORMATS)
 
 # Supported local file extensions
-AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.opus', '.aac', '.wma'}
-VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv', '.m4v', '.mpeg', '.mpg'}
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.opus', '.aac', '.wma'})
+VIDEO_EXTENSIONS = frozenset(
+    {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv', '.m4v', '.mpeg', '.mpg'}
+)
 MEDIA_EXTENSIONS = AUDIO_EXTENSIONS | VIDEO_EXTENSIONS
 
+# Tuple forms for str.endswith checks — avoids a Path allocation per call
+_AUDIO_EXT_TUPLE = tuple(sorted(AUDIO_EXTENSIONS))
+_MEDIA_EXT_TUPLE = tuple(sorted(MEDIA_EXTENSIONS))
+
+
+# Per-platform ID patterns, each run on one URL component after host dispatch
+_YT_ID = re.compile(r'[a-zA-Z0-9_-]{11}')
+_TT_VIDEO = re.compile(r'/video/(\d+)')
+_TW_VOD = re.compile(r'/videos/(\d+)')
+_TW_CLIP = re.compile(r'/clips?/([a-zA-Z0-9_-]+)')
+
+
+def _yt_watch_id(parts: SplitResult) -> str | None:
+    for value in parse_qs(parts.query).get('v', ()):
+        match = _YT_ID.match(value)
+        if match:
+            return f"yt_{match.group(0)}"
+    return None
+
+
+def _yt_short_id(parts: SplitResult) -> str | None:
+    match = _YT_ID.match(parts.path.lstrip('/'))
+    return f"yt_{match.group(0)}" if match else None
+
+
+def _tiktok_id(parts: SplitResult) -> str | None:
+    match = _TT_VIDEO.search(parts.path)
+    return f"tt_{match.group(1)}" if match else None
+
 
+def _twitch_id(parts: SplitResult) -> str | None:
+    match = _TW_VOD.search(parts.path)
+    if match:
+        return f"tw_{match.group(1)}"
+    match = _TW_CLIP.search(parts.path)
+    return f"twclip_{match.group(1)}" if match else None
+
+
+def _twitch_clip_id(parts: SplitResult) -> str | None:
+    name = parts.path.strip('/')
+    return f"twclip_{name}" if name else None
+
+
+_HOST_DISPATCH = {
+    'youtube.com': _yt_watch_id,
+    'm.youtube.com': _yt_watch_id,
+    'youtu.be': _yt_short_id,
+    'tiktok.com': _tiktok_id,
+    'vm.tiktok.com': _tiktok_id,
+    'twitch.tv': _twitch_id,
+    'm.twitch.tv': _twitch_id,
+    'clips.twitch.tv': _twitch_clip_id,
+}
+
+
+@lru_cache(maxsize=4096)
 def get_video_id(url: str) -> str:
     """Extract a unique video ID from URL."""
-    # YouTube
-    if 'youtube.com' in url or 'youtu.be' in url:
-        match = re.search(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})', url)
-        if match:
-            return f"yt_{match.group(1)}"
-    # TikTok
-    if 'tiktok.com' in url:
-        match = re.search(r'/video/(\d+)', url)
-        if match:
-            return f"tt_{match.group(1)}"
-    # Twitch VOD
-    if 'twitch.tv' in url:
-        match = re.search(r'/videos/(\d+)', url)
-        if match:
-            return f"tw_{match.group(1)}"
-        match = re.search(r'/clip/([a-zA-Z0-9_-]+)', url) or re.search(
-            r'clips\.twitch\.tv/([a-zA-Z0-9_-]+)', url
-        )
-        if match:
-            return f"twclip_{match.group(1)}"
-    # Fallback: hash the URL
-    return f"hash_{hashlib.md5(url.encode()).hexdigest()[:12]}"
+    # Host-first dispatch: split once, look the host up in a dict, then run
+    # at most one platform-specific pattern instead of trying each in turn.
+    parts = urlsplit(url if '://' in url else f'//{url}')
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    handler = _HOST_DISPATCH.get(host)
+    if handler:
+        video_id = handler(parts)
+        if video_id:
+            return video_id
+    # Fallback: hash the URL (blake2b emits exactly the 12 hex chars we need)
+    return f"hash_{hashlib.blake2b(url.encode('utf-8'), digest_size=6).hexdigest()}"
 
 
+@lru_cache(maxsize=256)
 def sanitize_filename(title: str, max_length: int = 50) -> str:
     """Create a safe filename from video title."""
-    safe = re.sub(r'[^\w\s-]', '', title)
-    safe = re.sub(r'\s+', '_', safe)
-    safe = re.sub(r'_+', '_', safe)
-    return safe.strip('_')[:max_length]
+    # Single pass: drop disallowed chars, collapse whitespace/underscore runs
+    # into one '_'.  Equivalent to the old three-regex pipeline
+    # (strip [^\w\s-], \s+ -> _, _+ -> _) without the intermediate strings.
+    out: list[str] = []
+    pending_sep = False
+    for ch in title:
+        if ch.isspace() or ch == '_':
+            pending_sep = True
+        elif ch.isalnum() or ch == '-':
+            if pending_sep:
+                out.append('_')
+                pending_sep = False
+            out.append(ch)
+        # anything else (punctuation, symbols) is dropped entirely
+    return ''.join(out).strip('_')[:max_length]
+
+
+# Common URL shapes checked first via startswith (a C-level prefix compare);
+# the substring fallback keeps scheme-less inputs working.
+_TIKTOK_PREFIXES = (
+    'https://www.tiktok.com/',
+    'https://tiktok.com/',
+    'https://vm.tiktok.com/',
+    'http://www.tiktok.com/',
+    'http://tiktok.com/',
+    'http://vm.tiktok.com/',
+)
+_TWITCH_PREFIXES = (
+    'https://www.twitch.tv/',
+    'https://twitch.tv/',
+    'https://m.twitch.tv/',
+    'https://clips.twitch.tv/',
+    'http://www.twitch.tv/',
+    'http://twitch.tv/',
+    'http://clips.twitch.tv/',
+)
 
 
+@lru_cache(maxsize=1024)
 def is_tiktok_url(url: str) -> bool:
     """Check if URL is a TikTok video."""
-    return 'tiktok.com' in url or 'vm.tiktok.com' in url
+    return url.startswith(_TIKTOK_PREFIXES) or 'tiktok.com' in url
 
 
+@lru_cache(maxsize=1024)
 def is_twitch_url(url: str) -> bool:
     """Check if URL is a Twitch video (VOD, clip, or stream)."""
-    return 'twitch.tv' in url
+    return url.startswith(_TWITCH_PREFIXES) or 'twitch.tv' in url
 
 
+@lru_cache(maxsize=1024)
 def is_local_file(path: str) -> bool:
     """Check if input is a local file path (not a URL)."""
     if path.startswith(('http://', 'https://')):
         return False
     if any(domain in path for domain in ['youtube.com', 'youtu.be', 'tiktok.com', 'twitch.tv']):
         return False
-    path_obj = Path(path)
-    return path_obj.suffix.lower() in MEDIA_EXTENSIONS
+    return path.lower().endswith(_MEDIA_EXT_TUPLE)
 
 
 def is_audio_file(path: str) -> bool:
     """Check if file is an audio file (vs video)."""
-    return Path(path).suffix.lower() in AUDIO_EXTENSIONS
+    return path.lower().endswith(_AUDIO_EXT_TUPLE)
+
+
+def _make_timestamp_formatter(sep: str):
+    """Build an HH:MM:SS<sep>mmm formatter with the separator baked in."""
+    fmt = f'%02d:%02d:%02d{sep}%03d'
+
+    def _format(seconds: float) -> str:
+        ms = int(round(seconds * 1000))
+        hours, rem = divmod(ms, 3_600_000)
+        minutes, rem = divmod(rem, 60_000)
+        secs, millis = divmod(rem, 1000)
+        return fmt % (hours, minutes, secs, millis)
 
+    return _format
 
-def format_timestamp_srt(seconds: float) -> str:
-    """Format seconds as SRT timestamp (HH:MM:SS,mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
+#: Format seconds as SRT timestamp (HH:MM:SS,mmm).
+format_timestamp_srt = _make_timestamp_formatter(',')
+#: Format seconds as VTT timestamp (HH:MM:SS.mmm).
+format_timestamp_vtt = _make_timestamp_formatter('.')
 
-def format_timestamp_vtt(seconds: float) -> str:
-    """Format seconds as VTT timestamp (HH:MM:SS.mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
 
+# Precomputed labels for the pyannote SPEAKER_NN namespace — called once per
+# segment, so the common case should be a dict hit, not a regex parse.
+_SPEAKER_LABELS = {f'SPEAKER_{i:02d}': f'Speaker {i + 1}' for i in range(64)}
+_SPEAKER_LABELS['UNKNOWN'] = 'Unknown'
 
+_RE_DIGITS = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=64)
 def format_speaker_label(speaker_id: str) -> str:
     """Convert pyannote speaker ID (SPEAKER_00) to friendly label (Speaker 1)."""
-    if speaker_id == 'UNKNOWN':
-        return 'Unknown'
-    match = re.search(r'(\d+)', speaker_id)
+    label = _SPEAKER_LABELS.get(speaker_id)
+    if label is not None:
+        return label
+    match = _RE_DIGITS.search(speaker_id)
     if match:
         num = int(match.group(1)) + 1
         return f"Speaker {num}"
@@ -116,20 +222,33 @@ def assign_speakers_to_segments(
     Uses overlap-based assignment: each transcript segment gets the speaker
     with the most overlap during that time range.
     """
+    if HAS_NUMPY and transcript_segments and diarization_segments:
+        return _assign_speakers_numpy(transcript_segments, diarization_segments)
+
+    # Two-pointer sweep: both lists come out of their engines ordered by
+    # start time, so each transcript segment only needs the diarization
+    # window that can still overlap it — O(T+D) instead of O(T*D). A
+    # diarization segment whose end precedes the current transcript start
+    # can never overlap a later segment either, so the lower bound only
+    # moves forward.
+    diar_sorted = sorted(diarization_segments, key=lambda d: d['start'])
+    n_diar = len(diar_sorted)
+    j_lo = 0
     for t_seg in transcript_segments:
         t_start, t_end = t_seg['start'], t_seg['end']
 
-        speaker_overlaps: dict[str, float] = {}
-        for d_seg in diarization_segments:
-            d_start, d_end = d_seg['start'], d_seg['end']
-
-            overlap_start = max(t_start, d_start)
-            overlap_end = min(t_end, d_end)
-            overlap = max(0, overlap_end - overlap_start)
+        while j_lo < n_diar and diar_sorted[j_lo]['end'] < t_start:
+            j_lo += 1
 
+        speaker_overlaps: dict[str, float] = {}
+        j = j_lo
+        while j < n_diar and diar_sorted[j]['start'] < t_end:
+            d_seg = diar_sorted[j]
+            overlap = min(t_end, d_seg['end']) - max(t_start, d_seg['start'])
             if overlap > 0:
                 speaker = d_seg['speaker']
                 speaker_overlaps[speaker] = speaker_overlaps.get(speaker, 0) + overlap
+            j += 1
 
         if speaker_overlaps:
             t_seg['speaker'] = max(speaker_overlaps, key=speaker_overlaps.get)
@@ -137,3 +256,41 @@ def assign_speakers_to_segments(
             t_seg['speaker'] = 'UNKNOWN'
 
     return transcript_segments
+
+
+def _assign_speakers_numpy(
+    transcript_segments: list[dict[str, Any]], diarization_segments: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Vectorized overlap assignment: one T×S matmul instead of a T·D Python loop."""
+    t_starts = np.array([s['start'] for s in transcript_segments])
+    t_ends = np.array([s['end'] for s in transcript_segments])
+    d_starts = np.array([s['start'] for s in diarization_segments])
+    d_ends = np.array([s['end'] for s in diarization_segments])
+
+    speakers: list[str] = []
+    speaker_ids: dict[str, int] = {}
+    d_speaker_idx = np.empty(len(diarization_segments), dtype=np.intp)
+    for i, d_seg in enumerate(diarization_segments):
+        speaker = d_seg['speaker']
+        if speaker not in speaker_ids:
+            speaker_ids[speaker] = len(speakers)
+            speakers.append(speaker)
+        d_speaker_idx[i] = speaker_ids[speaker]
+
+    # overlap[t, d] = length of intersection between transcript seg t and diar seg d
+    overlap = np.clip(
+        np.minimum(t_ends[:, None], d_ends[None, :])
+        - np.maximum(t_starts[:, None], d_starts[None, :]),
+        0,
+        None,
+    )
+    one_hot = np.zeros((len(diarization_segments), len(speakers)))
+    one_hot[np.arange(len(diarization_segments)), d_speaker_idx] = 1.0
+    per_speaker = overlap @ one_hot  # T×S total overlap per speaker
+
+    best = per_speaker.argmax(axis=1)
+    best_overlap = per_speaker.max(axis=1)
+    for t_seg, idx, total in zip(transcript_segments, best, best_overlap):
+        t_seg['speaker'] = speakers[idx] if total > 0 else 'UNKNOWN'
+
+    return transcript_segments